@@ -18,31 +18,60 @@
 # Bruce Watkins
 #
 
-import ssl
 import certifi
-import urllib.request
-from   bs4 import BeautifulSoup
+import requests
+import io
+import csv
+from   bs4 import BeautifulSoup, UnicodeDammit
 import pandas as pd
 import re
+from   functools import lru_cache
+from   concurrent.futures import ThreadPoolExecutor
+
+# lxml is much faster than BeautifulSoup at getting the text out of the
+# page, so use it if it is installed.
+try:
+	import lxml.html
+	from   lxml import etree
+except ImportError:
+	lxml = None
+
+# Regular expressions used while parsing the page, compiled once.
+_YEAR_RE         = re.compile(r"\d{4}")
+_SUFFIX_RE       = re.compile(r'(?:,\s*|\s+)(Jr\.?|Sr\.?|II|III|IV|V)$', re.IGNORECASE)
+_BR_RE           = re.compile(rb"<br\b[^>]*>", re.IGNORECASE)
+
+# The first three letters of each month name, for spotting issue lines.
+_MONTH_PREFIXES = frozenset({
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
+})
+
+# Name particles that belong with the last name, e.g. van Vogt.
+_PARTICLES = frozenset({
+    "van", "von", "de", "del", "di", "da", "la", "le", "du",
+    "dos", "st", "st.", "ter", "van der", "van den", "de la"
+})
+
+# All of the downloads come from the same server, so share one session
+# (and so one kept-alive connection) between them. Avoid issues with web 
+# site certificates and pretend that we are a Chrome browser.
+_SESSION = requests.Session()
+_SESSION.verify = certifi.where()
+_SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'})
 
 #-------------------------------------------------------------------
 def file_from_url(url_path):
 
-	# Avoid issues with web site certificates and pretend that 
-	# we are a Chrome browser.
-	context = ssl.create_default_context(cafile=certifi.where())
-	headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
-
 	# Try requesting the page from the server. If that fails, display 
 	# an error message and exit.
-	req = urllib.request.Request(url_path, headers=headers)
-
 	try:
-	    with urllib.request.urlopen(req, context=context) as response:
-	        the_file = response.read()
+	    response = _SESSION.get(url_path, timeout=30)
+	    response.raise_for_status()
+	    the_file = response.content
 
-	except urllib.error.HTTPError as e:
-	    print(f"HTTP Error: {e.code} - {e.reason}")
+	except requests.exceptions.HTTPError as e:
+	    print(f"HTTP Error: {e.response.status_code} - {e.response.reason}")
 	    raise SystemExit(1)
 
 	return the_file
@@ -50,42 +79,60 @@ def file_from_url(url_path):
 #### End of function file_from_url
 
 #-------------------------------------------------------------------
-def html_to_soup(html_path):
+def html_to_text(html_path):
 #
 # Read the HTML file containing the list of issues and their
-# stories, and return a BeautifulSoup object with the parsed
-# HTML.
+# stories, and return the text of the page, with one issue or
+# story per line.
 #
 	html = file_from_url(html_path)
-	soup = BeautifulSoup(html, "html.parser")
 
-	return soup
+	# Replace all the br tags with new line characters. Doing this to the
+	# raw HTML saves walking (and editing) the parsed tree afterwards.
+	html = _BR_RE.sub(b"\n", html)
+
+	# Work out the page's encoding (from a meta tag, or by trying likely
+	# ones) the way BeautifulSoup does, since lxml, given bytes, would 
+	# just assume Latin-1 and garble names like René.
+	html = UnicodeDammit(html, is_html=True).unicode_markup
+
+	# Use lxml if it is installed, otherwise fall back to BeautifulSoup
+	# with python's built-in html parser. Like get_text(), leave out the
+	# contents of any script and style tags.
+	if lxml:
+		root = lxml.html.fromstring(html)
+		etree.strip_elements(root, "script", "style", with_tail=False)
+		text = root.text_content()
+	else:
+		text = BeautifulSoup(html, "html.parser").get_text()
 
-#### End of function html_to_soup
+	return text
+
+#### End of function html_to_text
 
 #-------------------------------------------------------------------
-def soup_to_dataframe(the_soup):
+def text_to_dataframe(page_text):
 #
-# Walk thru the lines of the html, creating a list of dictionary
-# elements, each containing Year, Month, Title, Published-As-Author.
-# Then use that list to create a pandas dataframe object and 
+# Walk thru the lines of the page text, collecting the Year, Month, Title,
+# and Published-As-Author of each story into one list per column.
+# Then use those lists to create a pandas dataframe object and 
 # return it.
 #
-	# Replace all the br tags with new line characters.
-	for br in the_soup.find_all("br"):
-	    br.replace_with("\n")
-
-	# Split the html text into a list of individual lines.
-	text  = the_soup.get_text()
-	lines = text.splitlines()
+	# Split the page text into a list of individual lines.
+	lines = page_text.splitlines()
 
 	# Initialize for the loop that will walk thru the list of lines.
-	records       = []
-	current_issue = None
-	months = [
+	# The story data is collected into one list per column.
+	years         = []
+	month_names   = []
+	titles        = []
+	pub_as        = []
+	current_month = ""
+	current_year  = ""
+	months = frozenset({
 	    "January","February","March","April","May","June",
 	    "July","August","September","October","November","December"
-	]
+	})
 
 	line_num = 0
 	num_stories = 0
@@ -98,58 +145,65 @@ def soup_to_dataframe(the_soup):
 		if not line:
 			continue
 
-	    # Split this line into words. If there are just
+	    # Most lines are stories, so first make a cheap check: an issue
+	    # line starts with the start of a month name and ends with a digit.
+	    # If it passes, split this line into words. If there are just
 	    # 2 words, see if they are a month name followed by 
-	    # a year. If so set the current issue.
+	    # a year. If so set the current issue's month and year.
 		is_issue_line = False
 
-		words = line.split()
-		if len(words) == 2:
-		    if (words[0] in months) & (re.match(r"\d\d\d\d",words[1]) != None):
-		        is_issue_line = True
-		        current_issue = line
-		        # print(f'current issue: [{line}]')
-		        # print(f'  prev issue had {num_stories} stories')
-		        num_stories = 0
+		if line[:3] in _MONTH_PREFIXES and line[-1].isdigit():
+			words = line.split()
+			if len(words) == 2:
+			    if words[0] in months and _YEAR_RE.fullmatch(words[1]):
+			        is_issue_line = True
+			        current_month, current_year = words
+			        # print(f'current issue: [{line}]')
+			        # print(f'  prev issue had {num_stories} stories')
+			        num_stories = 0
 
 		# Process lines that are not issue lines.
 		if not is_issue_line:
 
-		    # Try to match "Title (Author)"
-		    m = re.match(r"^(.*)\(([^()]*)\)$", line)
+		    # Try to match "Title (Author)": the line must end with a 
+		    # parenthesized author, with no other parentheses inside it.
+		    left_paren = line.rfind("(") if line.endswith(")") else -1
 
-		    if m:
-		        title  = m.group(1).strip()
-		        author = m.group(2).strip()
+		    if left_paren != -1 and ")" not in line[left_paren+1:-1]:
+		        title  = line[:left_paren].strip()
+		        author = line[left_paren+1:-1].strip()
 		    else:
 		        print(f'could not match line number {line_num} [{line}], does not appear to be Title (Author)')
 		        continue
 
-		    # Split issue into month + year
-		    if current_issue:
-		        parts = current_issue.split()
-		        if len(parts) == 2:
-		            month, year = parts
-		        else:
-		            month, year = current_issue, ""
-		    else:
-		        month, year = "", ""
-
 		    num_stories += 1
-		    records.append({
-		        "Year": year,
-		        "Month": month,
-		        "Title": title,
-		        "Published_As": author
-		    })
-
-	story_dataframe = pd.DataFrame(records)
+		    years.append(current_year)
+		    month_names.append(current_month)
+		    titles.append(title)
+		    pub_as.append(author)
+
+	story_dataframe = pd.DataFrame({
+	    "Year": years,
+	    "Month": month_names,
+	    "Title": titles,
+	    "Published_As": pub_as
+	}, copy=False)
+
+	# Give the columns compact types instead of leaving them all as 
+	# python objects: Year as a small integer (nullable, in case a story
+	# line came before the first issue line), Month as a category, and
+	# Title and Published_As as pandas strings.
+	story_dataframe["Year"]         = pd.to_numeric(story_dataframe["Year"], errors="coerce").astype("UInt16")
+	story_dataframe["Month"]        = story_dataframe["Month"].astype("category")
+	story_dataframe["Title"]        = story_dataframe["Title"].astype("string")
+	story_dataframe["Published_As"] = story_dataframe["Published_As"].astype("string")
 
 	return story_dataframe
 
-#### End of function soup_to_dataframe
+#### End of function text_to_dataframe
 
 #-------------------------------------------------------------------
+@lru_cache(maxsize=None)
 def last_first(name):
 #
 # Given a person's name in first last format, returns the name in
@@ -162,8 +216,7 @@ def last_first(name):
         return name
 
     # Recognize suffixes like Jr., Sr., II, III
-    suffix_re = re.compile(r'(?:,\s*|\s+)(Jr\.?|Sr\.?|II|III|IV|V)$', re.IGNORECASE)
-    m = suffix_re.search(name)
+    m = _SUFFIX_RE.search(name)
     suffix = ""
     if m:
         suffix = m.group(1).strip()
@@ -174,28 +227,19 @@ def last_first(name):
         last, rest = [p.strip() for p in name.split(',', 1)]
         result = f"{last}, {rest}" if rest else last
     else:
-        tokens = name.split()
-        if len(tokens) == 1:
-            result = tokens[0]
+        # Only the last two words matter, so split off just those.
+        parts = name.rsplit(maxsplit=2)
+        if len(parts) == 1:
+            result = parts[0]
         else:
-            particles = {
-                "van", "von", "de", "del", "di", "da", "la", "le", "du",
-                "dos", "st", "st.", "ter", "van der", "van den", "de la"
-            }
-            two_word = ""
-            if len(tokens) >= 3:
-                last_two = (tokens[-2] + " " + tokens[-1]).lower()
-                if last_two in particles:
-                    two_word = last_two
-            if two_word:
-                last = tokens[-2] + " " + tokens[-1]
-                first = " ".join(tokens[:-2])
-            elif tokens[-2].lower() in particles:
-                last = tokens[-2] + " " + tokens[-1]
-                first = " ".join(tokens[:-2])
+            two_word = (len(parts) == 3
+                        and (parts[-2] + " " + parts[-1]).lower() in _PARTICLES)
+            if two_word or parts[-2].lower() in _PARTICLES:
+                last = parts[-2] + " " + parts[-1]
+                first = parts[0] if len(parts) == 3 else ""
             else:
-                last = tokens[-1]
-                first = " ".join(tokens[:-1])
+                last = parts[-1]
+                first = " ".join(parts[:-1])
             result = f"{last}, {first}" if first else last
 
     if suffix:
@@ -208,23 +252,7 @@ def last_first(name):
 #### End of function last_first
 
 #-------------------------------------------------------------------
-def normalize_author(name):
-#
-# Given an author's name, return that name transformed into
-# last, first format. Also combine any spelling variants of names
-# into a single version of that name, and also change pen names
-# into the actual name of the author.
-#
-	norm_name = name
-	norm_name = last_first(norm_name)
-	norm_name = combine_spellings(norm_name)
-	norm_name = process_pennames(norm_name)
-
-	return norm_name
-
-#### End of function normalize_author
-
-#-------------------------------------------------------------------
+@lru_cache(maxsize=None)
 def spell_lastfirst(name):
 
 	new_name = name
@@ -235,50 +263,89 @@ def spell_lastfirst(name):
 #### End of function author_lastfirst_spell
 
 #-------------------------------------------------------------------
+@lru_cache(maxsize=None)
 def combine_spellings(name):
 #
 #
 #
-	real_name = change_aliases(name, spell_map)
+	real_name = change_aliases(name, spell_matcher)
 	return real_name
 
 #### End of function combine_spellings
 
 #-------------------------------------------------------------------
+@lru_cache(maxsize=None)
 def process_pennames(name):
 #
 #
 #
-	real_name = change_aliases(name, pen_map)
+	real_name = change_aliases(name, pen_matcher)
 	return real_name
 
 #### End of function process_pennames
 
 #-------------------------------------------------------------------
-def change_aliases(author, namemap):
+def change_aliases(author, matcher):
 #
-# Given an author's name and a dictionary (map) that matches names
-# to alternative names (misspellings or pen names), return the "real" 
-# name of the author that should be used in place of the pen name or 
-# alternative spelling found in the map.
+# Given an author's name and a matcher built by alias_matcher() from a 
+# dictionary (map) that matches names to alternative names (misspellings 
+# or pen names), return the "real" name of the author that should be used 
+# in place of the pen name or alternative spelling found in the map.
 #
-    for real_name, aliases in namemap.items():
-        if any(alias.lower() in str(author).lower() for alias in aliases):
-            return real_name
+    pattern, real_names = matcher
+
+    m = pattern.match(str(author).lower())
+    if m and m.lastindex:
+        return real_names[m.lastindex - 1]
 
     return author  # if no match, keep the original name
 
 ##### End of function change_aliases
 
+#-------------------------------------------------------------------
+def alias_matcher(namemap):
+#
+# Given a dictionary (map) that matches real names to lists of 
+# alternative names, return a compiled regex together with the list 
+# of real names, for use by change_aliases().
+#
+# The regex has one branch per real name: a lookahead that looks for 
+# any of that name's aliases anywhere in the author's name, followed 
+# by an empty group that records which branch matched.
+# The branches are tried in map order, so the result is the same as 
+# checking each entry of the map in turn, but the whole scan is done 
+# by the regex engine instead of a python loop. The aliases are put
+# into lower case here, once, and change_aliases() lowers the author's 
+# name before matching, rather than matching with re.IGNORECASE.
+#
+	real_names = list(namemap.keys())
+	branches   = []
+
+	for aliases in namemap.values():
+		any_alias = "|".join(re.escape(alias.lower()) for alias in aliases)
+		branches.append(f"(?=.*?(?:{any_alias}))()")
+
+	pattern = re.compile("|".join(branches), re.DOTALL)
+
+	return pattern, real_names
+
+##### End of function alias_matcher
+
 #-------------------------------------------------------------------
 def csv_to_map(csv_path):
 
-	dframe = read_df_from_csv(csv_path)
+	# These are small two-column files, so read them with the csv module
+	# rather than building a pandas dataframe.
+	the_text = file_from_url(csv_path).decode("utf-8-sig")
+	reader   = csv.reader(io.StringIO(the_text))
+	next(reader) # skip the heading row
 	themap = {}
 
-	for index, row in dframe.iterrows():
-		value_list = dframe.iloc[index, 1].split('|')
-		themap[dframe.iloc[index, 0]] = [s.strip() for s in value_list]
+	# The first column holds the real name, the second holds the
+	# alternative names, separated by | characters.
+	for row in reader:
+		if row:
+			themap[row[0]] = [s.strip() for s in row[1].split('|')]
 
 	return themap
 
@@ -287,56 +354,49 @@ def csv_to_map(csv_path):
 #-------------------------------------------------------------------
 def write_csv(story_dataframe, file_name):
 #
+# Write the stories to a CSV file. The dataframe's index is written
+# as the first column, labeled Seq: the app shows it as the sequence
+# number of each story.
 #
-#
-	story_dataframe.to_csv(file_name)
+	story_dataframe.to_csv(file_name, index_label="Seq")
 
 	print(f"CSV file created: {file_name}")
 
 #### End of function write_csv
 
-#-------------------------------------------------------------------
-def read_df_from_csv(file_path, drop_index=False):
-##
-## Return a pandas dataframe, given the path to a CSV spreadsheet. 
-##
-	if drop_index:
-		try:
-			df_from_csv = pd.read_csv(file_path, index_col=0)
-		except FileNotFoundError:
-		    st.error(f"Error: The file '{file_path}' was not found.")
-		    sys.exit()
-	else:
-		try:
-			df_from_csv = pd.read_csv(file_path)
-		except FileNotFoundError:
-		    st.error(f"Error: The file '{file_path}' was not found.")
-		    sys.exit()
-
-	return df_from_csv
-
-#### End of function read_df_from_csv
-
 ##==================================================================================
 ##                               M  A  I  N                                       ##
 ##==================================================================================
 
-# Get the list of spelling variations and the list of pen names as dictionaries (maps).
+# Get the list of spelling variations and the list of pen names as dictionaries (maps),
+# and read the html page and get its text. The three downloads don't depend on each
+# other, so run them at the same time.
 spellings_path = 'https://brucewatkins.org/sciencefiction/data/spellings-Spelling.csv'
 pennames_path  = 'https://brucewatkins.org/sciencefiction/data/pennames-PenNames.csv'
-pen_map   = csv_to_map(pennames_path)
-spell_map = csv_to_map(spellings_path)
-
-# Read the html page and parse it with BeautifulSoup.
-soup = html_to_soup('https://brucewatkins.org/sciencefiction/data/origpage.html')
-
-# Walk through the lines in the soup object, and create a dataframe listing the stories.
-stories = soup_to_dataframe(soup)
-
-# Add an Author column in which multiple spellings have been eliminated,
-# and pen names have been replaced with actual names, and 
-stories["Author"]       = stories["Published_As"].apply(normalize_author)
-stories["Published_As"] = stories["Published_As"].apply(spell_lastfirst)
+html_path      = 'https://brucewatkins.org/sciencefiction/data/origpage.html'
+
+with ThreadPoolExecutor(max_workers=3) as executor:
+	pen_future   = executor.submit(csv_to_map, pennames_path)
+	spell_future = executor.submit(csv_to_map, spellings_path)
+	html_future  = executor.submit(html_to_text, html_path)
+
+	pen_map   = pen_future.result()
+	spell_map = spell_future.result()
+	page_text = html_future.result()
+
+pen_matcher   = alias_matcher(pen_map)
+spell_matcher = alias_matcher(spell_map)
+
+# Walk through the lines of the page text, and create a dataframe listing the stories.
+stories = text_to_dataframe(page_text)
+
+# Put the Published_As names into last, first format with spellings 
+# combined, then add an Author column in which pen names have also been
+# replaced with actual names. Most authors have many stories, so keep 
+# the names as categories: mapping a function over a categorical column 
+# calls it just once for each distinct name.
+stories["Published_As"] = stories["Published_As"].astype("category").map(spell_lastfirst).astype("category")
+stories["Author"]       = stories["Published_As"].map(process_pennames)
 
 # Write the result to a spreadsheet in CSV format.
 write_csv(stories, 'goldenstories.csv')
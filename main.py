@@ -15,69 +15,52 @@
 import streamlit               as st
 import pandas                  as pd
 import streamlit.components.v1 as components
-import matplotlib.pyplot       as plt
+import matplotlib
+matplotlib.use('Agg')          # plots are only ever drawn to image files
+from   matplotlib.figure       import Figure
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
 from   matplotlib.backends.backend_pdf import PdfPages
 import matplotlib.ticker       as ticker
 import io
+import html
 from io import BytesIO
-import sys
 import requests
 import datetime
+import time
 
-#-------------------------------------------------------------------
-def list_to_table(heading_list, rows_list):
-##
-## Generate and return the text of an HTML table.
-##
-## rows_list:    a list of lists with the values for the rows,
-## heading_list: text for the table headings.
-##
-	html_text = [
-	'<table id="interact" class="display" style="width:100%"> ',
-	' <thead>',
-	'  <tr>'
-	]
-
-	for head in heading_list:
-		html_text.append(f'  <th>{head}</th>')
+# Largest number of rows that show_data_table() will put into a page.
+MAX_TABLE_ROWS = 5000
 
-	html_text.append(' </tr>')
-	html_text.append('</thead>')
+# Seconds to wait before trying again to read a CSV file that failed.
+LOAD_RETRY_SECONDS = 60
 
-	html_text.append(' <tbody>')
+# Most plot images (and, separately, PDFs) to keep cached at one time.
+MAX_CACHED_PLOTS = 50
 
-	for this_row in rows_list:
-		# st.write(this_row)
-		html_text.append(' <tr>')
-		for this_col in this_row:
-			html_text.append(f'  <td>{this_col}</td>')
-		html_text.append(' </tr>')
+# The years covered by the data, as numbers and as heading strings.
+YEARS     = tuple(range(1939, 1961))
+YEAR_STRS = tuple(map(str, YEARS))
 
-	html_text.append(' </tbody>')
-	html_text.append('</table>')
-
-	return "\n".join(html_text)
-
-### End of function list_to_table
+# The columns of the author by year table, and their headings.
+AUTHOR_YEAR_HEADS     = ('Author', 'Total', *YEARS)
+AUTHOR_YEAR_HEAD_STRS = ('Author', 'Total', *YEAR_STRS)
 
 #-------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
 def author_pivot():
 ##
 ## Return a pandas dataframe containing the number of stories by
-## each author for each year. Assumes that the table of all
-## stories has already been read into a global dataframe
-## named df_all_stories.
-##
-	author_year_pivot = pd.pivot_table(
-	    df_all_stories,
-	    index="Author",
-	    columns="Year",
-	    values="Title",     # counting stories
-	    aggfunc="count",
-	    fill_value=0        # if no stories that year, put 0
-	)
-	author_year_pivot["Total"] = author_year_pivot.sum(axis=1)
-	author_year_pivot = author_year_pivot.reset_index()
+## each author for each year, and their total, with the author
+## names in the first column. Built from the cached author/year
+## counts (see author_year_counts), and itself cached.
+##
+## The totals are in column 2, so you don't have to scroll to the 
+## right to see them, and the rows are sorted by largest total first.
+##
+	author_year_pivot = author_year_counts().reset_index()
+
+	author_year_pivot = author_year_pivot[list(AUTHOR_YEAR_HEADS)]
+	author_year_pivot = author_year_pivot.sort_values(by='Total', ascending=False)
 
 	return author_year_pivot
 
@@ -101,16 +84,40 @@ def show_data_table(panda_df, heading_list, widthCol, widthVal):
 	<link rel="stylesheet" type="text/css" href="https://cdn.datatables.net/2.3.5/css/dataTables.dataTables.css">
 	<script type="text/javascript" src="https://code.jquery.com/jquery-3.7.1.js"></script>
 	<script type="text/javascript" src="https://cdn.datatables.net/2.3.5/js/dataTables.js"></script>
+	<link rel="stylesheet" type="text/css" href="https://cdn.datatables.net/scroller/2.4.3/css/scroller.dataTables.css">
+	<script type="text/javascript" src="https://cdn.datatables.net/scroller/2.4.3/js/dataTables.scroller.js"></script>
+	<style>#interact { width: 100%; }</style>
 	"""
+	# Very large tables are too much to send to the browser, so show just
+	# the first rows (the download button still provides all of them).
+	if len(panda_df) > MAX_TABLE_ROWS:
+		st.warning(f'Showing the first {MAX_TABLE_ROWS:,} of {len(panda_df):,} rows.')
+		panda_df = panda_df.head(MAX_TABLE_ROWS)
+
+	# The rows are passed to DataTables as a JSON array, which it turns
+	# into table rows itself, rather than as HTML markup for every cell.
+	# (to_json escapes / characters, so a title can't end the script.)
+	table_data = panda_df.to_json(orient='values')
+
 	data_table_script = f"""
 		<script>
 		let table = new DataTable
 		(
 		'#interact', 
 		{{
+		 "data": {table_data},
 		 "autoWidth": false,
 		 "order": [],
-	     columnDefs: [ {{ targets: {widthCol}, width: '{widthVal}' }}]
+		 "deferRender": true,
+		 "paging": true,
+		 "pageLength": 50,
+		 "scrollY": '600px',
+		 "scrollCollapse": true,
+		 "scroller": true,
+	     columnDefs: [ 
+	        {{ targets: {widthCol}, width: '{widthVal}' }},
+	        {{ targets: '_all', defaultContent: '', render: DataTable.render.text() }}
+	     ]
 		}}
 		);
 
@@ -124,35 +131,95 @@ def show_data_table(panda_df, heading_list, widthCol, widthVal):
 
 		</script>
 	"""
-	list_of_rows = panda_df.to_numpy().tolist()
-	html_table   = list_to_table(heading_list, list_of_rows)
-	the_html     = data_table_links + html_table + data_table_script
-	components.html(the_html, height=2000, width=1500, scrolling=True)
+	# Only the table headings are written as HTML. Its id and class are 
+	# the ones the DataTables script looks for.
+	head_cells = ''.join(f'<th>{html.escape(str(head))}</th>' for head in heading_list)
+	html_table = f'<table id="interact" class="display"><thead><tr>{head_cells}</tr></thead></table>'
+	the_html = data_table_links + html_table + data_table_script
+	# DataTables scrolls the rows itself, so the frame only has to hold
+	# the 600px scrolling area plus the search box and page information.
+	components.html(the_html, height=700, scrolling=True)
 
 #### End of function show_data_table
 
 #-------------------------------------------------------------------
-def read_df_from_csv(file_path, drop_index=False):
+@st.cache_data(ttl=3600, show_spinner=False)
+def read_df_from_csv(file_path, dtype=None):
 ##
 ## Return a pandas dataframe, given the path to a CSV spreadsheet. 
 ##
-	if drop_index:
-		try:
-			df_from_csv = pd.read_csv(file_path, index_col=0)
-		except FileNotFoundError:
-		    st.error(f"Error: The file '{file_path}' was not found.")
-		    sys.exit()
-	else:
-		try:
-			df_from_csv = pd.read_csv(file_path)
-		except FileNotFoundError:
-		    st.error(f"Error: The file '{file_path}' was not found.")
-		    sys.exit()
+## The result is cached, so that the file is downloaded and parsed
+## once an hour rather than on every rerun of the script (i.e. every
+## time the user changes a widget).
+##
+## dtype: optional dictionary of column names to pandas dtypes.
+##
+## The file is parsed with pyarrow's (multithreaded) CSV reader, which
+## is faster than pandas' own; the columns are still ordinary pandas
+## (or the given) dtypes.
+##
+	df_from_csv = pd.read_csv(file_path, dtype=dtype, engine='pyarrow')
 
 	return df_from_csv
 
 #### End of function read_df_from_csv
 
+#-------------------------------------------------------------------
+@st.cache_resource
+def failed_loads():
+##
+## Return the dictionary, shared by all sessions, of CSV paths that
+## could not be read, with the time of the most recent failure.
+##
+	return {}
+
+#### End of function failed_loads
+
+#-------------------------------------------------------------------
+def load_csv(file_path, dtype=None):
+##
+## Return the (cached) dataframe for a CSV spreadsheet, as returned by
+## read_df_from_csv. If the file can't be read, display an error and
+## stop this run of the script. A failure is remembered for a minute,
+## so that reruns during that time don't each try to download the 
+## file again.
+##
+	failures  = failed_loads()
+	failed_at = failures.get(file_path)
+
+	if failed_at is None or time.time() - failed_at > LOAD_RETRY_SECONDS:
+		try:
+			return read_df_from_csv(file_path, dtype)
+		except OSError:
+			failures[file_path] = time.time()
+
+	st.error(f"Error: The file '{file_path}' could not be read.")
+	st.stop()
+
+#### End of function load_csv
+
+#-------------------------------------------------------------------
+def load_all_stories():
+##
+## Return the (cached) dataframe listing all stories, with compact
+## types for the year, month and title columns. Author is a category,
+## so that grouping and comparing authors works on small integer codes
+## instead of strings.
+##
+## Published_As is left as plain strings: show_pennames() compares it
+## with Author row by row, which a second categorical column (with
+## different categories) would not allow.
+##
+	story_types = {
+		'Year':   'int16',
+		'Month':  'category',
+		'Title':  'string[pyarrow]',
+		'Author': 'category'
+	}
+	return load_csv(all_stories_path, dtype=story_types)
+
+#### End of function load_all_stories
+
 #-------------------------------------------------------------------
 def show_dl_button(kind, object, btn_label, file_name):
 ##
@@ -177,6 +244,38 @@ def show_dl_button(kind, object, btn_label, file_name):
 
 #### End of function show_dl_button
 
+#-------------------------------------------------------------------
+def figure_bytes(fig, file_format):
+##
+## Return a matplotlib figure as the bytes of a 'png' image (for 
+## display) or a 'pdf' file (for downloading).
+##
+	buffer = io.BytesIO()
+	if file_format == 'png':
+		fig.savefig(buffer, format="png", dpi=110, bbox_inches="tight")
+	else:
+		fig.savefig(buffer, format=file_format, bbox_inches="tight")
+
+	return buffer.getvalue()
+
+#### End of function figure_bytes
+
+#-------------------------------------------------------------------
+def show_pdf_dl_button(dataframe, which_type, title, file_name):
+##
+## Display a button in the sidebar for preparing a PDF copy of a plot,
+## and once it has been clicked, the button for downloading it. The
+## PDF is only drawn when asked for, instead of on every rerun.
+##
+## The first three arguments are as for show_plot_with_dl_button.
+##
+	with st.sidebar:
+		if st.button('Prepare PDF'):
+			pdf_bytes = render_pdf(dataframe, which_type, title)
+			show_dl_button('pdf', pdf_bytes, 'Download as PDF', file_name)
+
+#### End of function show_pdf_dl_button
+
 #-------------------------------------------------------------------
 def show_multiline_plot_with_dl(index_list, value_lists, authors, title):
 ##
@@ -188,35 +287,120 @@ def show_multiline_plot_with_dl(index_list, value_lists, authors, title):
 ##				author.
 ## authors:		List of author names.
 ##
-	fig, ax = plt.subplots()
+	# Put each author's counts into a column of one dataframe, so that
+	# all the lines are drawn by a single (cached) line plot.
+	dataframe = pd.DataFrame(dict(zip(authors, value_lists)), index=index_list)
+	png_bytes = render_plot(dataframe, 'line', title)
 
-	for ndx, value_list in enumerate(value_lists):
-		dataframe = pd.DataFrame(
-		    {
-		        f"{authors[ndx]}": value_list
-		    },
-		    index=index_list,
-		)
-		ax = dataframe.plot(kind='line', ax=ax, marker='.', title=title, grid=True)
+	show_plot_image(png_bytes)
 
+	show_pdf_dl_button(dataframe, 'line', title, 'multiplot.pdf')
+
+#### End of function show_multiline_plot_with_dl
+
+#-------------------------------------------------------------------
+def draw_bar(fig, ax, dataframe, title):
+##
+## Draw a stacked bar chart, one bar per row of the dataframe.
+##
+	dataframe.plot(kind='bar', stacked=True, ax=ax, title=title, grid=True)
+
+#### End of function draw_bar
+
+#-------------------------------------------------------------------
+def draw_line(fig, ax, dataframe, title):
+##
+## Draw a line for each column of the dataframe, with whole numbers
+## on both axes.
+##
+	dataframe.plot(kind='line', ax=ax, marker='.', title=title, grid=True)
 	ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
 	ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
 	ax.spines['bottom'].set_position(('data', 0))
 
-	plt.tight_layout()
-	st.set_page_config(layout="centered")
-	st.pyplot(fig)
+#### End of function draw_line
 
-	# Save the plot to a BytesIO object as PDF
-	pdf_buffer = io.BytesIO()
-	plt.savefig(pdf_buffer, format="pdf", bbox_inches="tight")
-	pdf_buffer.seek(0)
+#-------------------------------------------------------------------
+def draw_barh(fig, ax, dataframe, title):
+##
+## Draw a horizontal bar for each value, largest (first) at the top.
+## Drawn with matplotlib directly, since there is only one series and
+## no legend; the bar height matches pandas' barh.
+##
+	if len(dataframe) > 20:
+		fig.set_size_inches(8, 8)
+	ax.barh(dataframe.index.astype(str), dataframe.to_numpy().ravel(), height=0.5)
+	ax.invert_yaxis()
+	ax.grid(color='black', linestyle=':', linewidth=1.0, axis='x', alpha=0.6)
+	ax.set_title(title)
+	ax.set_xlabel('Number of Stories')
+
+#### End of function draw_barh
+
+# The drawing function for each kind of plot.
+PLOTTERS = {
+	'bar':  draw_bar,
+	'line': draw_line,
+	'barh': draw_barh
+}
 
-	show_dl_button('pdf', pdf_buffer, 'Download PDF', 'multiplot.pdf')
+#-------------------------------------------------------------------
+def draw_plot(dataframe, which_type, title):
+##
+## Return a new matplotlib figure with a plot of the dataframe.
+##
+## Arguments are as for show_plot_with_dl_button.
+##
+	# Create the figure directly rather than through pyplot, so there is
+	# no global figure to close afterwards, and give it its own Agg canvas
+	# to be saved with. The tight layout is applied when it is saved.
+	fig = Figure(layout='tight')
+	FigureCanvasAgg(fig)
+	ax  = fig.subplots()
 
-	plt.close()
+	PLOTTERS[which_type](fig, ax, dataframe, title)
 
-#### End of function show_multiline_plot_with_dl
+	return fig
+
+#### End of function draw_plot
+
+#-------------------------------------------------------------------
+@st.cache_data(ttl=3600, max_entries=MAX_CACHED_PLOTS, show_spinner=False)
+def render_plot(dataframe, which_type, title):
+##
+## Draw a plot of the dataframe and return it as PNG bytes. Cached on
+## the data, plot type and title, so a given plot is drawn only once
+## rather than on every rerun.
+##
+## Arguments are as for show_plot_with_dl_button.
+##
+	return figure_bytes(draw_plot(dataframe, which_type, title), 'png')
+
+#### End of function render_plot
+
+#-------------------------------------------------------------------
+@st.cache_data(ttl=3600, max_entries=MAX_CACHED_PLOTS, show_spinner=False)
+def render_pdf(dataframe, which_type, title):
+##
+## Draw a plot of the dataframe and return it as PDF bytes. Cached
+## like render_plot, but only called when a PDF is asked for.
+##
+	return figure_bytes(draw_plot(dataframe, which_type, title), 'pdf')
+
+#### End of function render_pdf
+
+#-------------------------------------------------------------------
+def show_plot_image(png_bytes):
+##
+## Display a plot image in the middle of the (wide) page, at about the
+## width it would have in Streamlit's centered layout.
+##
+	left_fill, middle, right_fill = st.columns([1, 2, 1])
+
+	with middle:
+		st.image(png_bytes)
+
+#### End of function show_plot_image
 
 #-------------------------------------------------------------------
 def show_plot_with_dl_button(dataframe, which_type, title):
@@ -227,53 +411,51 @@ def show_plot_with_dl_button(dataframe, which_type, title):
 ## which_type:	'bar' chart or 'line' plot or 'barh' horiz. bar
 ## title:		title for the generated plot
 ##
-	fig, ax = plt.subplots()
+	png_bytes = render_plot(dataframe, which_type, title)
 
-	match which_type:
+	show_plot_image(png_bytes)
 
-		case 'bar':
-			dataframe.plot(kind=which_type, stacked=True, ax=ax, title=title, grid=True)
+	show_pdf_dl_button(dataframe, which_type, title, 'matplotlib_plot.pdf')
 
-		case 'line':
-			ax = dataframe.plot(kind=which_type, ax=ax, marker='.', title=title, grid=True)
-			ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-			ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-			ax.spines['bottom'].set_position(('data', 0))
-
-		case 'barh':
-			if len(dataframe) > 20:
-				fig.set_size_inches(8, 8)
-			ax = dataframe.plot.barh(legend=False)
-			ax.invert_yaxis()
-			plt.grid(color='black', linestyle=':', linewidth=1.0, axis='x', alpha=0.6)
-			plt.title(title)
-			plt.xlabel('Number of Stories')
-			plt.ylabel('')
+#### End of function show_plot_with_dl_button
 
-	plt.tight_layout()
-	st.set_page_config(layout="centered")
-	st.pyplot(fig)
+#-------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def csv_bytes(df):
+##
+## Return a dataframe as the bytes of a CSV spreadsheet. Cached on the
+## contents of the dataframe, so a table is encoded once rather than
+## every time its download button is displayed.
+##
+	return df.to_csv(index=False).encode('utf-8')
 
-	# Save the plot to a BytesIO object as PDF
-	pdf_buffer = io.BytesIO()
-	plt.savefig(pdf_buffer, format="pdf", bbox_inches="tight")
-	pdf_buffer.seek(0)
+#### End of function csv_bytes
 
-	with st.sidebar:
-		show_dl_button('pdf', pdf_buffer, 'Download as PDF', 'matplotlib_plot.pdf')
+#-------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def parquet_bytes(df):
+##
+## Return a dataframe as the bytes of a (zstd compressed) Parquet 
+## file, which is smaller and quicker to produce than a CSV file and
+## keeps the column types. Cached like csv_bytes.
+##
+	# Parquet only allows string column names, and the author by year
+	# table has a column for each year number.
+	buffer = io.BytesIO()
+	df.rename(columns=str).to_parquet(buffer, engine='pyarrow', compression='zstd', index=False)
 
-	# Close the Matplotlib figure to free up memory
-	plt.close()
+	return buffer.getvalue()
 
-#### End of function show_plot_with_dl_button
+#### End of function parquet_bytes
 
 #-------------------------------------------------------------------
 def show_csv_dl_button(df, dl_file_name):
 ##
-## Display a button for downloadig a table as a CSV spreadsheet.
+## Display buttons for downloadig a table as a CSV spreadsheet, or 
+## as a Parquet file (with the same name, ending in .parquet).
 ##
 	# Create a csv version of the data.
-	csv = df.to_csv(index=False).encode('utf-8')
+	csv = csv_bytes(df)
 
 	# Provide a download button.
 	with st.sidebar:
@@ -284,6 +466,13 @@ def show_csv_dl_button(df, dl_file_name):
 		    mime='text/csv', 			# The MIME type for CSV files
 	)
 
+		st.download_button(
+		    label="Download as Parquet",
+		    data=parquet_bytes(df),
+		    file_name=dl_file_name.removesuffix('.csv') + '.parquet',
+		    mime='application/vnd.apache.parquet',
+	)
+
 #### End of function show_csv_dl_button
 
 #-------------------------------------------------------------------
@@ -296,7 +485,6 @@ def show_full_listing():
 	"""
 	st.markdown(title, unsafe_allow_html=True)
 
-	st.set_page_config(layout="wide")
 	heading_list = ['Seq', 'Year', 'Month', 'Title', 'Pub As', 'Author']
 	show_data_table(df_all_stories, heading_list,'1', '25px')
 
@@ -335,7 +523,7 @@ def show_one_month():
 	year_col, month_col, go_button_col, fill2, fill3, fill4, fill5 = st.columns(7)
 
 	with year_col:
-	    the_year = st.selectbox("Year", range(1939, 1961), index=None, placeholder="Year...", label_visibility="collapsed")
+	    the_year = st.selectbox("Year", YEARS, index=None, placeholder="Year...", label_visibility="collapsed")
 
 	with month_col:
 		months = ["1 January", "2 February", "3 March", "4 April", "5 May", "6 June", "7 July", "8 August", "9 September", "10 October", "11 November", "12 December"]
@@ -453,15 +641,13 @@ def show_author_totals():
 ## Display total number of stories by each author, sorted by largest
 ## number of published stories first.
 ##
-	author_counts = df_all_stories.groupby("Author").size().reset_index(name="StoryCount")
-	author_counts.sort_values(by='StoryCount', ascending=False, inplace=True)
+	author_counts = author_totals().reset_index(name="StoryCount")
 
 	title = f"""
 	<h5>Total Number of Stories Published by Each Author</h5>
 	"""
 	st.markdown(title, unsafe_allow_html=True)
 
-	st.set_page_config(layout="centered")
 	heading_list = ['Author', 'Story Count']
 	show_data_table(author_counts, heading_list, '0', '25%')
 
@@ -477,25 +663,13 @@ def show_author_by_year():
 ##
 	author_year_pivot = author_pivot()
 
-	# Move the totals to column 2, so you don't have to scroll to the right to see it.
-	new_heads = ['Author', 'Total', 1939, 
-			1940, 1941, 1942, 1943, 1944, 1945, 1946, 1947, 1948, 1949, 
-			1950, 1951, 1952, 1953, 1954, 1955, 1956, 1957, 1958, 1959, 
-			1960] 
-	author_year_pivot = author_year_pivot[new_heads]
-	author_year_pivot = author_year_pivot.sort_values(by='Total', ascending=False)
-
 	title = f"""
 	<h5>Number of Stories Published by Each Author By Year</h5>
 	"""
 	st.markdown(title, unsafe_allow_html=True)
 
 	# Display the table
-	heading_list = ['Author', 'Total', '1939', 
-			'1940', '1941', '1942', '1943', '1944', '1945', '1946', '1947', '1948', '1949', 
-			'1950', '1951', '1952', '1953', '1954', '1955', '1956', '1957', '1958', '1959', 
-			'1960'] 
-	st.set_page_config(layout="wide")
+	heading_list = AUTHOR_YEAR_HEAD_STRS
 	show_data_table(author_year_pivot, heading_list, '1', '100px')
 
 	show_csv_dl_button(author_year_pivot, 'storiesByYear.csv')
@@ -524,7 +698,7 @@ def show_pennames():
 def show_stacked_bar_chart():
 ##
 ## Display a bar chart with number of stories each year by the
-## top 10 overall authors.
+## top N overall authors.
 ##
 
 	default = 5
@@ -532,13 +706,9 @@ def show_stacked_bar_chart():
 	with st.sidebar:
 		num_authors = st.number_input('number of authors:', min_value=1, value=default, step=1)
 
-	if "Total" in author_year_pivot.columns:
-	    top_authors = author_year_pivot.sort_values("Total", ascending=False).head(num_authors)
-	    top_authors = top_authors.drop(columns=["Total"])
-	else:
-	    top_authors = author_year_pivot.loc[author_year_pivot.sum(axis=1).nlargest(num_authors).index]
-
-	top_authors = top_authors.drop(top_authors.columns[0], axis=1)
+	# The rows of the cached author/year counts for the authors with the
+	# most stories, without their Total column.
+	top_authors = author_year_counts().nlargest(num_authors, 'Total').drop(columns='Total')
 	year_author = top_authors.T # Transpose so years are rows, authors are columns
 
 	title = f'Number of Stories Published Each Year by the Top {num_authors} Authors'
@@ -547,6 +717,52 @@ def show_stacked_bar_chart():
 
 #### End of function show_stacked_bar_chart
 
+#-------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def author_year_counts():
+##
+## Return a dataframe with one row per author and one column per
+## year from 1939 to 1960, holding the number of stories that author
+## published that year (zero if none), plus a Total column. Computed 
+## once and cached; the author tables and plots are all slices of it.
+##
+	counts = df_all_stories.groupby(['Author', 'Year'], observed=True).size().unstack(fill_value=0)
+
+	# Make sure every year has a column, even if no one published
+	# a story that year.
+	counts = counts.reindex(columns=YEARS, fill_value=0)
+	counts["Total"] = counts.sum(axis=1)
+
+	return counts
+
+#### End of function author_year_counts
+
+#-------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def author_totals():
+##
+## Return a series with the total number of stories by each author,
+## sorted by largest number of stories first. Cached, so changing the
+## number of authors to show just takes a different slice of it.
+##
+	return author_year_counts()['Total'].sort_values(ascending=False, kind='stable')
+
+#### End of function author_totals
+
+#-------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def sorted_authors():
+##
+## Return a list of the unique author names, in alpha order, for the
+## author menus. Cached, since the list never changes between reruns.
+##
+## Author is a categorical column, so its categories are already the
+## unique (non-missing) names; there's no need to scan every row.
+##
+	return df_all_stories['Author'].cat.categories.sort_values().tolist()
+
+#### End of function sorted_authors
+
 #-------------------------------------------------------------------
 def author_count_by_year_df(an_author):
 ##
@@ -554,20 +770,11 @@ def author_count_by_year_df(an_author):
 ## that author for each year, including zeros for years in which they
 ## published no stories.
 ##
-	author_df    = df_all_stories[df_all_stories["Author"].str.contains(an_author, na=False)]
-	story_counts = author_df.groupby('Year').agg(Num_Stories=('Year', 'count')).reset_index()
-
-	year_list  = story_counts['Year'].tolist()
-	count_list = story_counts['Num_Stories'].tolist()
-	author_counts = pd.DataFrame({'Num_Stories': count_list}, index=year_list)
-
-	# Reindex the two column dataframe using all years, filling with
-	# zeros where this author had no stories in that year.
-	all_keys = [1939, 
-			1940, 1941, 1942, 1943, 1944, 1945, 1946, 1947, 1948, 1949, 
-			1950, 1951, 1952, 1953, 1954, 1955, 1956, 1957, 1958, 1959, 
-			1960] 
-	author_counts = author_counts.reindex(all_keys, fill_value=0)
+## an_author must be an exact name from the Author column.
+##
+	# The columns of the counts are mixed (the years and 'Total'), so put
+	# the years back as a plain integer index, for the plot's x axis.
+	author_counts = author_year_counts().loc[an_author, list(YEARS)].set_axis(YEARS).to_frame('Num_Stories')
 
 	return author_counts
 
@@ -585,6 +792,19 @@ def plot_one_author(an_author):
 
 #### End of function plot_one_author
 
+#-------------------------------------------------------------------
+def plot_several_authors(authors):
+##
+## Display a line plot of stories published by each of several
+## authors for each year.
+##
+	count_lists = [author_count_by_year_df(this_author)['Num_Stories'] for this_author in authors]
+
+	title = f"{len(authors)} authors: number of stories each year"
+	show_multiline_plot_with_dl(YEARS, count_lists, authors, title)
+
+#### End of function plot_several_authors
+
 #-------------------------------------------------------------------
 def show_one_author_plot():
 ##
@@ -594,11 +814,9 @@ def show_one_author_plot():
 ## selected author.
 ##
 
-	# Pull the authors column, turn it into a unique set of names,
-	# convert that to a python list, and sort that into alpha order.
 	# Use the sorted unique list of author names to present the user
 	# with a drop down menu: which author should the plot be made for?
-	author_list = sorted(set(df_all_stories['Author'].tolist()))
+	author_list = sorted_authors()
 	with st.sidebar:
 		author_name = st.selectbox(
 		"pick an author:",
@@ -625,7 +843,7 @@ def plot_multiple_authors():
 ## 
 ##
 	# Get a sorted list of all authors.
-	author_list = sorted(set(df_all_stories['Author'].tolist()))
+	author_list = sorted_authors()
 
 	# Show a drop down menu of all the authors.
 	with st.sidebar:
@@ -636,39 +854,24 @@ def plot_multiple_authors():
 		)
 		clicked = st.button("Plot selected Authors")
 
-	if selected_authors:
-
-		# Generate the plot, but only if the button has been clicked.
-		if clicked:
-			count_lists = []
-			authors     = []
-			for this_author in selected_authors:
-				author_counts = author_count_by_year_df(this_author)
-				authors.append(this_author)
-				count_lists.append(author_counts['Num_Stories'])
+	# Remember which authors were last plotted, so the plot is still
+	# shown on later reruns, e.g. after the 'Prepare PDF' button is 
+	# clicked, until the selection is changed.
+	if clicked:
+		st.session_state['plotted_authors'] = selected_authors
 
-			year_list = list(range(1939, 1961))
+	if selected_authors:
 
-			title = f"{len(authors)} authors: number of stories each year"
-			show_multiline_plot_with_dl(year_list, count_lists, authors, title)
+		# Generate the plot, but only once the button has been clicked.
+		if st.session_state.get('plotted_authors') == selected_authors:
+			plot_several_authors(selected_authors)
 
 	else:
 		message = html_from_file("https://brucewatkins.org/sciencefiction/data/multhelp.html")
 		st.markdown(message, unsafe_allow_html=True)
 
-		authors = []
-		count_lists = []
-		selected_authors = ["Heinlein, Robert A.", "Asimov, Isaac"]
-		for this_author in selected_authors:
-			author_counts = author_count_by_year_df(this_author)
-			authors.append(this_author)
-			count_lists.append(author_counts['Num_Stories'])
-
-		year_list = list(range(1939, 1961))
-
-		title = f"{len(authors)} authors: number of stories each year"
-		show_multiline_plot_with_dl(year_list, count_lists, authors, title)
-
+		examples = ["Heinlein, Robert A.", "Asimov, Isaac"]
+		plot_several_authors(examples)
 
 #### End of function show_select_authors
 
@@ -681,7 +884,7 @@ def show_top_n():
 	with st.sidebar:
 		num_authors = st.number_input('number of authors:', min_value=1, value=default, step=1)
 
-	top_authors = df_all_stories["Author"].value_counts().head(num_authors)
+	top_authors = author_totals().head(num_authors)
 	show_plot_with_dl_button(top_authors, 'barh', f'Number of Stories by the Top {num_authors} Authors')
 
 #### End of function show_top_20
@@ -716,15 +919,29 @@ def html_from_file(url, replacements=[]):
 #### End of function html_from_file
 
 #-------------------------------------------------------------------
-def show_about():
-##
+@st.cache_data(ttl=3600, show_spinner=False)
+def summary_stats():
 ##
+## Return the numbers of years, issues, stories and authors in the
+## data, for the about page. Cached, since they never change between
+## reruns.
 ##
 	num_years   = df_all_stories['Year'].nunique()
 	num_issues  = len(df_all_stories.drop_duplicates(subset=['Year', 'Month']))
 	num_stories = len(df_all_stories)
 	num_authors = df_all_stories['Author'].nunique()
 
+	return num_years, num_issues, num_stories, num_authors
+
+#### End of function summary_stats
+
+#-------------------------------------------------------------------
+def show_about():
+##
+##
+##
+	num_years, num_issues, num_stories, num_authors = summary_stats()
+
 	left_fill, img_one, center_fill, img_two, right_fill = st.columns(5)
 
 	with img_one:
@@ -744,19 +961,18 @@ def show_about():
 ##                               M  A  I  N                                       ##
 ##==================================================================================
 
-# Read the two spreadsheets (all stories and author pivot) from this project's github repository
+# Set the page layout once, before anything else is displayed.
+st.set_page_config(layout="wide")
+
+# Read the spreadsheets (all stories and pen names) from this project's github repository
 # and put that data into pandas dataframe objects: global variables.
 # all_stories_csv_github  = "https://raw.githubusercontent.com/ecurbsniktaw/ASF-Statistics/refs/heads/main/data/astounding_contents.csv"
-# author_pivot_csv_github = "https://raw.githubusercontent.com/ecurbsniktaw/ASF-Statistics/refs/heads/main/data/author_story_counts_by_year.csv"
 # df_all_stories    = read_df_from_csv(all_stories_csv_github)
-# author_year_pivot = read_df_from_csv(author_pivot_csv_github, True)
 
 all_stories_path  = "https://brucewatkins.org/sciencefiction/data/astounding_contents.csv"
-author_pivot_path = "https://brucewatkins.org/sciencefiction/data/author_story_counts_by_year.csv"
 pen_name_path     = "https://brucewatkins.org/sciencefiction/data/pennames-PenNames.csv"
-df_all_stories    = read_df_from_csv(all_stories_path)
-author_year_pivot = read_df_from_csv(author_pivot_path, True)
-df_pen_names      = read_df_from_csv(pen_name_path)
+df_all_stories    = load_all_stories()
+df_pen_names      = load_csv(pen_name_path)
 
 # Put a drop down menu into the page's sidebar, listing the options for
 # displaying the story/author data as tables and as plots (using LaTeX
@@ -779,8 +995,6 @@ with st.sidebar:
 )
 # End of sidebar
 
-st.set_page_config(layout="wide")
-
 if type_display:
 
 	match type_display: